@@ -10,6 +10,7 @@ from pydantic import BaseModel
 
 # Import your chatbot (this will load embeddings + models on import)
 import chatbot  # your file name, same folder
+from chat_queue import ChatGate
 
 app = FastAPI(title="Serene Chat API")
 
@@ -34,12 +35,10 @@ class ChatOut(BaseModel):
 def healthz():
     return {"status": "ok"}
 
-@app.post("/v1/serene-chat", response_model=ChatOut)
-def serene_chat(body: ChatIn):
-    user_text = (body.text or "").strip()
-    if not user_text:
-        raise HTTPException(status_code=400, detail="text is required")
+# generation runs on a bounded executor behind an admission queue (429/503 when full)
+_CHAT_GATE = ChatGate()
 
+def _chat_reply(user_text: str) -> ChatOut:
     # Optional: check crisis separately so you can mark the response
     is_crisis = False
     try:
@@ -53,3 +52,18 @@ def serene_chat(body: ChatIn):
         raise HTTPException(status_code=500, detail=f"chatbot error: {e}")
 
     return ChatOut(reply=reply, crisis=is_crisis)
+
+@app.post("/v1/serene-chat", response_model=ChatOut)
+async def serene_chat(body: ChatIn):
+    user_text = (body.text or "").strip()
+    if not user_text:
+        raise HTTPException(status_code=400, detail="text is required")
+    return await _CHAT_GATE.run(_chat_reply, user_text)
+
+@app.get("/v1/serene-chat/status")
+def serene_chat_status():
+    return _CHAT_GATE.stats()
+
+@app.on_event("shutdown")
+def _shutdown_chat_gate():
+    _CHAT_GATE.shutdown()
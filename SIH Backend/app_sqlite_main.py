@@ -1,9 +1,15 @@
 # app_sqlite_main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import sqlite3, os, importlib
-from typing import Optional
+import sqlite3, os, importlib, queue
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import List, Optional
+
+from chat_queue import ChatGate
+from counselor_cache import CounselorDirectory, COUNSELOR_CACHE_TTL, not_modified
+from write_behind import WriteBehind, WRITE_BEHIND, MODES as WRITE_BEHIND_MODES, insert_batch
 
 # ---------- App & CORS ----------
 DB_PATH = os.getenv("SQLITE_DB", "demo.db")
@@ -103,6 +109,57 @@ def _execute(sql, params=()):
         conn.commit()
         return cur.lastrowid
 
+# ---------- write-behind (optional batching for moods / journal, see write_behind.py) ----------
+WRITE_STATEMENTS = {
+    "moods": (
+        "INSERT INTO moods (mood, alias) VALUES (?, ?)",
+        "SELECT id, mood, alias, created_at FROM moods WHERE id BETWEEN ? AND ? ORDER BY id",
+    ),
+    "journal": (
+        "INSERT INTO journal_entries (user_alias, text) VALUES (?, ?)",
+        "SELECT id, user_alias, text, created_at FROM journal_entries WHERE id BETWEEN ? AND ? ORDER BY id",
+    ),
+}
+WRITE_BEHIND_TIMEOUT = float(os.getenv("WRITE_BEHIND_TIMEOUT", "10"))  # group mode: max wait for commit
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "500"))
+
+if WRITE_BEHIND not in WRITE_BEHIND_MODES:
+    raise ValueError(f"WRITE_BEHIND must be one of {sorted(WRITE_BEHIND_MODES)}, got {WRITE_BEHIND!r}")
+_WRITER = WriteBehind(DB_PATH, WRITE_STATEMENTS) if WRITE_BEHIND != "off" else None
+
+def _buffered_insert(key, params):
+    """Queue one row on the write-behind buffer; wait for its commit unless mode is async."""
+    try:
+        fut = _WRITER.submit(key, params)
+    except queue.Full:
+        # don't park threadpool threads on a full buffer; health/counselors share them
+        raise HTTPException(status_code=503, detail="write queue full, try again",
+                            headers={"Retry-After": "1"})
+    if WRITE_BEHIND == "async":
+        return JSONResponse(status_code=202, content={"status": "queued"})
+    try:
+        return fut.result(timeout=WRITE_BEHIND_TIMEOUT)
+    except FutureTimeout:
+        if fut.cancel():
+            # still queued: it will never be written, so retrying is safe
+            raise HTTPException(status_code=503, detail="write queue busy, try again",
+                                headers={"Retry-After": "1"})
+        # already part of a batch being committed: don't invite a duplicate retry
+        return JSONResponse(status_code=202, content={"status": "pending"})
+
+def _bulk_insert(key, rows):
+    if not rows:
+        raise HTTPException(400, "No rows")
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(413, f"Too many rows (max {BULK_MAX_ROWS})")
+    with _get_conn() as conn:
+        return insert_batch(conn, *WRITE_STATEMENTS[key], rows)
+
+@app.on_event("shutdown")
+def _flush_write_behind():
+    if _WRITER:
+        _WRITER.close()
+
 # ---------- health / dbcheck ----------
 @app.get("/v1/health")
 def health():
@@ -121,23 +178,46 @@ def dbcheck():
         return {"db": "error", "error": str(e)}
 
 # ---------- counselors ----------
+# Served from an in-process snapshot (see counselor_cache.py); call
+# _COUNSELORS.invalidate() after writing to the counselors table.
+_COUNSELORS = CounselorDirectory(lambda: _fetchall(
+    "SELECT id, name, specialty, languages, bio, cal_link "
+    "FROM counselors WHERE visible=1 ORDER BY name"
+))
+
 @app.get("/v1/counselors")
-def get_counselors():
-    return _fetchall(
-        "SELECT id, name, specialty, languages, bio, cal_link "
-        "FROM counselors WHERE visible=1 ORDER BY name"
-    )
+def get_counselors(
+    specialty: Optional[str] = None,
+    language: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+):
+    snap, body, etag = _COUNSELORS.lookup(specialty, language)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": snap.last_modified_http,
+        "Cache-Control": f"public, max-age={int(min(COUNSELOR_CACHE_TTL, 60))}, must-revalidate",
+    }
+    if not_modified(if_none_match, if_modified_since, etag, snap.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # ---------- moods ----------
+MOOD_CHOICES = {"happy", "calm", "neutral", "sad", "anxious"}
+
 class MoodIn(BaseModel):
     mood: str
     alias: Optional[str] = None
 
+class MoodBulkIn(BaseModel):
+    items: List[MoodIn]
+
 @app.post("/v1/moods")
 def create_mood(m: MoodIn):
-    allowed = {"happy", "calm", "neutral", "sad", "anxious"}
-    if m.mood not in allowed:
+    if m.mood not in MOOD_CHOICES:
         raise HTTPException(400, "Invalid mood")
+    if _WRITER:
+        return _buffered_insert("moods", (m.mood, m.alias))
     rowid = _execute(
         "INSERT INTO moods (mood, alias) VALUES (?, ?)",
         (m.mood, m.alias),
@@ -147,13 +227,24 @@ def create_mood(m: MoodIn):
         (rowid,),
     )
 
+@app.post("/v1/moods/bulk")
+def create_moods_bulk(b: MoodBulkIn):
+    if any(m.mood not in MOOD_CHOICES for m in b.items):
+        raise HTTPException(400, "Invalid mood")
+    return _bulk_insert("moods", [(m.mood, m.alias) for m in b.items])
+
 # ---------- journal ----------
 class JournalIn(BaseModel):
     user_alias: str
     text: str
 
+class JournalBulkIn(BaseModel):
+    entries: List[JournalIn]
+
 @app.post("/v1/journal")
 def add_entry(j: JournalIn):
+    if _WRITER:
+        return _buffered_insert("journal", (j.user_alias, j.text))
     rowid = _execute(
         "INSERT INTO journal_entries (user_alias, text) VALUES (?, ?)",
         (j.user_alias, j.text),
@@ -163,6 +254,10 @@ def add_entry(j: JournalIn):
         (rowid,),
     )
 
+@app.post("/v1/journal/bulk")
+def add_entries_bulk(b: JournalBulkIn):
+    return _bulk_insert("journal", [(j.user_alias, j.text) for j in b.entries])
+
 @app.get("/v1/journal")
 def list_entries(user_alias: str):
     return _fetchall(
@@ -201,12 +296,12 @@ def list_posts(status: str = "live"):
 class ChatIn(BaseModel):
     text: str
 
-@app.post("/v1/serene-chat")
-def serene_chat(payload: ChatIn):
-    text = (payload.text or "").strip()
-    if not text:
-        raise HTTPException(status_code=400, detail="Empty text")
+# LLM work gets its own bounded executor + admission queue (see chat_queue.py);
+# the handler is async so waiting requests don't hold threadpool threads.
+_CHAT_GATE = ChatGate()
 
+def _chat_reply(text: str) -> dict:
+    """Blocking part of /v1/serene-chat; runs on the chat executor."""
     err = _load_chatbot()
     if err:
         raise HTTPException(status_code=503, detail=f"chatbot not ready: {err}")
@@ -220,3 +315,18 @@ def serene_chat(payload: ChatIn):
         reply = _CHATBOT["generate_reply"](text)
 
     return {"reply": reply, "crisis": crisis}
+
+@app.post("/v1/serene-chat")
+async def serene_chat(payload: ChatIn):
+    text = (payload.text or "").strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Empty text")
+    return await _CHAT_GATE.run(_chat_reply, text)
+
+@app.get("/v1/serene-chat/status")
+def serene_chat_status():
+    return _CHAT_GATE.stats()
+
+@app.on_event("shutdown")
+def _shutdown_chat_gate():
+    _CHAT_GATE.shutdown()
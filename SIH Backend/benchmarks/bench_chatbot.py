@@ -0,0 +1,75 @@
+# benchmarks/bench_chatbot.py
+# Micro-benchmarks for the chatbot hot path (retrieval, reranking, crisis check,
+# ALIVE wrap, full reply). Runs offline on stub models by default.
+#
+#   python benchmarks/bench_chatbot.py --iterations 500 --out bench_chatbot.json
+import argparse, contextlib, io, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from offline import SAMPLE_MESSAGES, load_chatbot
+from stats import summarize, write_report
+
+def _time_calls(fn, inputs, iterations: int, warmup: int) -> dict:
+    for i in range(warmup):
+        fn(inputs[i % len(inputs)])
+    samples, errors = [], 0
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        arg = inputs[i % len(inputs)]
+        start = time.perf_counter()
+        try:
+            fn(arg)
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - t0, errors)
+
+def build_cases(cb):
+    """name -> (callable, inputs). Everything takes one positional argument."""
+    rerank_inputs = []
+    for msg in SAMPLE_MESSAGES:
+        qv = cb.embedder.encode([msg], normalize_embeddings=True, convert_to_numpy=True).astype("float32")
+        _, I = cb.index.search(qv, cb.K_RETRIEVE)
+        rerank_inputs.append([(msg, cb.docs[i]["q"]) for i in I[0] if 0 <= i < len(cb.docs)])
+
+    cases = {
+        "retrieve_context": (cb.retrieve_context, SAMPLE_MESSAGES),
+        "embed_query": (lambda m: cb.embedder.encode([m], normalize_embeddings=True, convert_to_numpy=True),
+                        SAMPLE_MESSAGES),
+        "assess_crisis": (cb.assess_crisis, SAMPLE_MESSAGES),
+        "alive_wrap": (lambda m: cb.alive_wrap(m, "Try one small step today."), SAMPLE_MESSAGES),
+        "generate_reply": (cb.generate_reply, SAMPLE_MESSAGES[:-1]),  # skip the crisis sample
+    }
+    if cb.USE_RERANKER:
+        cases["rerank"] = (cb.reranker.predict, rerank_inputs)
+    return cases
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Chatbot micro-benchmarks (offline by default).")
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--warmup", type=int, default=10)
+    ap.add_argument("--csv-rows", type=int, default=500, help="rows in the synthetic CSV")
+    ap.add_argument("--gen-latency-ms", type=float, default=0.0, help="simulated LLM time per reply")
+    ap.add_argument("--real-models", action="store_true", help="load the real models from chatbot.py")
+    ap.add_argument("--only", nargs="*", help="subset of benchmark names to run")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    random.seed(args.seed)  # alive_wrap / template choice use the global RNG
+    with contextlib.redirect_stdout(io.StringIO()):  # chatbot prints every reply
+        cb = load_chatbot(stub=not args.real_models, csv_rows=args.csv_rows,
+                          gen_latency_ms=args.gen_latency_ms)
+        results = {}
+        for name, (fn, inputs) in build_cases(cb).items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = _time_calls(fn, inputs, args.iterations, args.warmup)
+
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    config["docs"] = len(cb.docs)
+    write_report("chatbot-micro", config, results, args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/load_api.py
+# asyncio load generator for the SQLite API. By default it drives the app
+# in-process (httpx ASGI transport, stub chatbot, throwaway DB); pass --base-url
+# to hit a running server instead.
+#
+#   python benchmarks/load_api.py --concurrency 32 --duration 20 --out load.json
+#   python benchmarks/load_api.py --base-url http://127.0.0.1:8000 --mix moods=5,journal=3
+import argparse, asyncio, contextlib, io, itertools, os, random, sys, time
+from collections import Counter, defaultdict
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from offline import SAMPLE_MESSAGES, load_sqlite_app
+from stats import summarize, write_report
+
+MOODS = ["happy", "calm", "neutral", "sad", "anxious"]
+BULK_ROWS = 50  # rows per */bulk call
+
+# name -> (method, path, payload factory taking a request counter)
+ENDPOINTS = {
+    "serene-chat": ("POST", "/v1/serene-chat",
+                    lambda n: {"text": SAMPLE_MESSAGES[n % (len(SAMPLE_MESSAGES) - 1)]}),
+    "journal": ("POST", "/v1/journal",
+                lambda n: {"user_alias": f"student{n % 50}", "text": f"autosave #{n}: exams tomorrow"}),
+    "journal-bulk": ("POST", "/v1/journal/bulk",
+                     lambda n: {"entries": [{"user_alias": f"student{(n + i) % 50}", "text": f"autosave #{n}.{i}"}
+                                            for i in range(BULK_ROWS)]}),
+    "journal-list": ("GET", "/v1/journal", lambda n: {"user_alias": f"student{n % 50}"}),
+    "posts": ("POST", "/v1/posts",
+              lambda n: {"category": "exams", "body": f"Anyone else nervous about finals? ({n})", "anon": True}),
+    "posts-list": ("GET", "/v1/posts", lambda n: {"status": "pending"}),
+    "moods": ("POST", "/v1/moods", lambda n: {"mood": MOODS[n % len(MOODS)], "alias": f"student{n % 50}"}),
+    "moods-bulk": ("POST", "/v1/moods/bulk",
+                   lambda n: {"items": [{"mood": MOODS[(n + i) % len(MOODS)], "alias": f"student{(n + i) % 50}"}
+                                        for i in range(BULK_ROWS)]}),
+    "counselors": ("GET", "/v1/counselors", lambda n: None),
+    "health": ("GET", "/v1/health", lambda n: None),
+}
+ROWS_PER_CALL = {"journal": 1, "moods": 1, "posts": 1, "journal-bulk": BULK_ROWS, "moods-bulk": BULK_ROWS}
+DEFAULT_MIX = "serene-chat=1,journal=1,posts=1,moods=1"
+
+def parse_mix(spec: str) -> dict:
+    """'moods=5,journal=2' -> {'moods': 5.0, 'journal': 2.0}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+async def _one(client, name, n):
+    method, path, payload = ENDPOINTS[name]
+    body = payload(n)
+    if method == "GET":
+        return await client.get(path, params=body)
+    return await client.post(path, json=body)
+
+async def run_load(client, mix: dict, concurrency: int, duration: float, total: int, seed: int) -> dict:
+    """Closed-loop load: `concurrency` workers each issue one request at a time."""
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    counter = itertools.count()
+    latencies, errors, statuses = defaultdict(list), Counter(), defaultdict(Counter)
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        while True:
+            n = next(counter)
+            if (total and n >= total) or (deadline and time.perf_counter() >= deadline):
+                return
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                resp = await _one(client, name, n)
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = "conn-error"
+            elapsed = time.perf_counter() - start
+            statuses[name][str(status)] += 1
+            if status in (200, 202):
+                latencies[name].append(elapsed)
+            else:
+                errors[name] += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+
+    results = {}
+    for name in names:
+        extra = {"status": dict(statuses[name])}
+        if name in ROWS_PER_CALL:
+            extra["rows_per_s"] = round(len(latencies[name]) * ROWS_PER_CALL[name] / wall, 2) if wall else 0.0
+        results[name] = summarize(latencies[name], wall, errors[name], extra)
+    results["_all"] = summarize(list(itertools.chain.from_iterable(latencies.values())), wall,
+                                sum(errors.values()))
+    return results
+
+async def _main(args):
+    mix = parse_mix(args.mix)
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=timeout,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+    else:
+        app = load_sqlite_app(stub=not args.real_models, gen_latency_ms=args.gen_latency_ms,
+                              workdir=args.workdir)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                   base_url="http://bench", timeout=timeout)
+    async with client:
+        if args.warmup:
+            await run_load(client, mix, min(args.concurrency, 4), 0, args.warmup, args.seed)
+        return await run_load(client, mix, args.concurrency, args.duration, args.requests, args.seed)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load generator for the Serene SQLite API.")
+    ap.add_argument("--base-url", help="target a running server (default: in-process app)")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default: {DEFAULT_MIX})")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds; 0 = use --requests")
+    ap.add_argument("--requests", type=int, default=0, help="stop after N requests (0 = no limit)")
+    ap.add_argument("--warmup", type=int, default=20, help="requests issued before measuring")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--gen-latency-ms", type=float, default=200.0,
+                    help="simulated LLM time per chat reply (in-process mode)")
+    ap.add_argument("--workdir", help="where the throwaway DB/CSV go (put it on the disk you care about)")
+    ap.add_argument("--real-models", action="store_true", help="in-process mode with the real models")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+    if not args.duration and not args.requests:
+        ap.error("set --duration or --requests")
+
+    with contextlib.redirect_stdout(io.StringIO()):  # chatbot prints every reply
+        results = asyncio.run(_main(args))
+    write_report("api-load", {k: v for k, v in vars(args).items() if k != "out"}, results, args.out)
+
+if __name__ == "__main__":
+    main()
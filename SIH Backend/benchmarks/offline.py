@@ -0,0 +1,224 @@
+# benchmarks/offline.py
+# Offline fixtures for the benchmark suite: stub models, a synthetic CSV and a
+# throwaway SQLite database, so nothing has to be downloaded to run a bench.
+import os, sys, csv, time, random, hashlib, sqlite3, tempfile, threading, types
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)  # chatbot.py / app_sqlite_main.py live here
+
+STUB_DIM = 384                       # same width as all-MiniLM-L6-v2
+_TOKEN_RE_SPLIT = str.maketrans({c: " " for c in ".,!?;:'\"()-—’"})
+
+# ---------- synthetic data ----------
+TOPICS = ["exams", "sleep", "motivation", "relationship", "study", "deadlines",
+          "friends", "family", "hostel", "placements", "grades", "presentation"]
+FEELINGS = ["stressed", "anxious", "overwhelmed", "tired", "sad", "worried", "calm", "happy"]
+EMOTIONS = ["fear", "sadness", "neutral", "joy", "anger"]
+
+SAMPLE_MESSAGES = [
+    "I'm so stressed about my exams next week",
+    "I can't sleep properly because of study pressure",
+    "I have no motivation to study anymore",
+    "my relationship is making me anxious",
+    "hello",
+    "I feel overwhelmed with upcoming deadlines and placements",
+    "I'm worried I will fail my presentation",
+    "I sometimes think about suicide",
+]
+
+def write_synthetic_csv(path: str, rows: int = 500, seed: int = 7) -> str:
+    """Write a chatbot CSV (user_input, bot_response, emotion_tag) with `rows` rows."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(["user_input", "bot_response", "emotion_tag"])
+        for i in range(rows):
+            topic, feeling = rng.choice(TOPICS), rng.choice(FEELINGS)
+            w.writerow([
+                f"I feel {feeling} about {topic} ({i})",
+                f"It makes sense that {topic} leaves you {feeling}. One small step could help.",
+                rng.choice(EMOTIONS),
+            ])
+    return path
+
+# ---------- stub models ----------
+def _tokens(text: str) -> list:
+    return str(text).lower().translate(_TOKEN_RE_SPLIT).split()
+
+def _bucket(tok: str) -> int:
+    # stable across runs (builtin hash() is salted per process)
+    return int.from_bytes(hashlib.blake2b(tok.encode(), digest_size=4).digest(), "little") % STUB_DIM
+
+class StubSentenceTransformer:
+    """Hashed bag-of-words encoder with the SentenceTransformer surface chatbot.py uses."""
+    def __init__(self, name, *a, **kw):
+        self.name = name
+
+    def get_sentence_embedding_dimension(self):
+        return STUB_DIM
+
+    def encode(self, texts, normalize_embeddings=False, convert_to_numpy=True, **kw):
+        out = np.zeros((len(texts), STUB_DIM), dtype="float32")
+        for row, text in enumerate(texts):
+            for tok in _tokens(text):
+                out[row, _bucket(tok)] += 1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out /= np.where(norms == 0, 1.0, norms)
+        return out
+
+class StubCrossEncoder:
+    """Scores (query, doc) pairs by token overlap."""
+    def __init__(self, name, *a, **kw):
+        self.name = name
+
+    def predict(self, pairs, **kw):
+        scores = []
+        for q, d in pairs:
+            qt, dt = set(_tokens(q)), set(_tokens(d))
+            scores.append(len(qt & dt) / (len(qt | dt) or 1))
+        return np.asarray(scores, dtype="float32")
+
+class StubTokenizer:
+    pad_token = None
+    eos_token = "</s>"
+    eos_token_id = 2
+
+    @classmethod
+    def from_pretrained(cls, name, *a, **kw):
+        return cls()
+
+    def __call__(self, text, **kw):
+        return {"input_ids": text}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return ids
+
+class StubCausalLM:
+    """Echoes the prompt plus a canned reply after `gen_latency` seconds of simulated work.
+
+    Generations are serialised like a single CPU-bound model would be.
+    """
+    gen_latency = 0.0
+    _busy = threading.Lock()
+    REPLY = "That sounds really tough, and it's okay to feel this way. Try one small step today."
+
+    @classmethod
+    def from_pretrained(cls, name, *a, **kw):
+        return cls()
+
+    def generate(self, input_ids="", **kw):
+        if self.gen_latency:
+            with self._busy:
+                time.sleep(self.gen_latency)
+        return [f"{input_ids} {self.REPLY}"]
+
+class StubSequenceClassifier:
+    @classmethod
+    def from_pretrained(cls, name, *a, **kw):
+        return cls()
+
+def stub_pipeline(task, model=None, tokenizer=None, **kw):
+    """Emotion classifier: deterministic scores, with fear/sadness kept below crisis thresholds."""
+    def run(text):
+        seed = _bucket(text)
+        raw = [((seed + i * 37) % 100) / 100.0 + 0.01 for i in range(len(EMOTIONS))]
+        total = sum(raw)
+        return [[{"label": lbl, "score": min(r / total, 0.9)} for lbl, r in zip(EMOTIONS, raw)]]
+    return run
+
+class StubIndexFlatIP:
+    """numpy stand-in for faiss.IndexFlatIP (exact inner-product search)."""
+    def __init__(self, dim):
+        self.dim = dim
+        self._xb = np.zeros((0, dim), dtype="float32")
+
+    def add(self, x):
+        self._xb = np.vstack([self._xb, np.asarray(x, dtype="float32")])
+
+    def search(self, q, k):
+        sims = np.asarray(q, dtype="float32") @ self._xb.T
+        k = min(k, self._xb.shape[0])
+        idx = np.argsort(-sims, axis=1)[:, :k]
+        return np.take_along_axis(sims, idx, axis=1), idx
+
+def install_stub_models(gen_latency_ms: float = 0.0):
+    """Register stub `sentence_transformers`, `transformers` and `faiss` modules in sys.modules."""
+    st = types.ModuleType("sentence_transformers")
+    st.SentenceTransformer, st.CrossEncoder = StubSentenceTransformer, StubCrossEncoder
+
+    tf = types.ModuleType("transformers")
+    tf.AutoTokenizer = StubTokenizer
+    tf.AutoModelForCausalLM = StubCausalLM
+    tf.AutoModelForSequenceClassification = StubSequenceClassifier
+    tf.pipeline = stub_pipeline
+
+    fa = types.ModuleType("faiss")
+    fa.IndexFlatIP = StubIndexFlatIP
+
+    sys.modules.update({"sentence_transformers": st, "transformers": tf, "faiss": fa})
+    StubCausalLM.gen_latency = gen_latency_ms / 1000.0
+
+# ---------- loaders ----------
+def load_chatbot(stub: bool = True, csv_rows: int = 500, gen_latency_ms: float = 0.0, workdir: str = None):
+    """Import chatbot.py against a synthetic CSV; with `stub`, no model is downloaded.
+
+    Crisis e-mails are disabled so benchmarks never touch SMTP.
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="serene-bench-")
+    if stub:
+        install_stub_models(gen_latency_ms)
+    if "CHATBOT_CSV_PATH" not in os.environ or stub:
+        os.environ["CHATBOT_CSV_PATH"] = write_synthetic_csv(os.path.join(workdir, "chatbot.csv"), csv_rows)
+    import chatbot
+    chatbot.send_crisis_email = lambda user_text: None
+    return chatbot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counselors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL, specialty TEXT, languages TEXT, bio TEXT, cal_link TEXT,
+    visible INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS moods (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mood TEXT NOT NULL, alias TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS journal_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_alias TEXT NOT NULL, text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT, body TEXT NOT NULL, anon INTEGER DEFAULT 1, alias TEXT,
+    status TEXT DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+def make_demo_db(path: str, counselors: int = 25) -> str:
+    """Create the tables app_sqlite_main.py expects and seed a counselor directory."""
+    specialties = ["anxiety", "academic stress", "relationships", "sleep", "career"]
+    languages = ["English", "Hindi", "English, Hindi", "Tamil, English", "Bengali"]
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO counselors (name, specialty, languages, bio, cal_link, visible) "
+            "VALUES (?,?,?,?,?,1)",
+            [(f"Counselor {i:02d}", specialties[i % len(specialties)], languages[i % len(languages)],
+              "Campus counselor.", f"https://cal.com/counselor-{i}") for i in range(counselors)],
+        )
+        conn.commit()
+    return path
+
+def load_sqlite_app(stub: bool = True, gen_latency_ms: float = 0.0, workdir: str = None):
+    """Import app_sqlite_main against a fresh SQLite file and an offline chatbot."""
+    workdir = workdir or tempfile.mkdtemp(prefix="serene-bench-")
+    os.environ["SQLITE_DB"] = make_demo_db(os.path.join(workdir, "bench.db"))
+    load_chatbot(stub=stub, gen_latency_ms=gen_latency_ms, workdir=workdir)
+    import app_sqlite_main
+    return app_sqlite_main.app
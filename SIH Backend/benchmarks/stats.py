@@ -0,0 +1,48 @@
+# benchmarks/stats.py
+# Shared latency summaries + JSON report writer for the benchmark scripts.
+import json, math, sys, platform, time
+from typing import Optional
+
+def percentile(sorted_samples, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)."""
+    if not sorted_samples:
+        return 0.0
+    n = len(sorted_samples)
+    rank = min(max(1, math.ceil(pct / 100.0 * n)), n)
+    return sorted_samples[rank - 1]
+
+def summarize(samples, wall_s: float, errors: int = 0, extra: Optional[dict] = None) -> dict:
+    """Turn per-call latencies (seconds) into throughput + p50/p95/p99 in milliseconds."""
+    s = sorted(samples)
+    out = {
+        "count": len(s),
+        "errors": errors,
+        "wall_s": round(wall_s, 4),
+        "throughput_per_s": round(len(s) / wall_s, 2) if wall_s > 0 else 0.0,
+        "mean_ms": round(sum(s) / len(s) * 1000, 3) if s else 0.0,
+        "p50_ms": round(percentile(s, 50) * 1000, 3),
+        "p95_ms": round(percentile(s, 95) * 1000, 3),
+        "p99_ms": round(percentile(s, 99) * 1000, 3),
+        "max_ms": round(s[-1] * 1000, 3) if s else 0.0,
+    }
+    if extra:
+        out.update(extra)
+    return out
+
+def write_report(kind: str, config: dict, results: dict, out_path: Optional[str] = None) -> dict:
+    """Emit the report as JSON to `out_path` (or stdout) and return it."""
+    report = {
+        "kind": kind,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
@@ -0,0 +1,92 @@
+# chat_queue.py
+# Admission control for the chat endpoints: LLM work runs on its own small thread
+# pool so it can't starve FastAPI's shared threadpool (health, journal, counselors),
+# and requests beyond a bounded queue fail fast with 429/503 + Retry-After.
+import asyncio, math, os, time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+
+CHAT_WORKERS       = int(os.getenv("CHAT_WORKERS", "1"))          # concurrent generations
+CHAT_QUEUE_MAX     = int(os.getenv("CHAT_QUEUE_MAX", "8"))        # requests allowed to wait
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "15")) # max seconds spent waiting
+
+class ChatGate:
+    """Bounded executor + admission queue.
+
+    - more than `workers + max_queue` requests in flight -> 429 (queue full)
+    - waited `timeout` seconds without getting a worker    -> 503 (overloaded)
+    Both carry a Retry-After estimated from recent generation times.
+    """
+    def __init__(self, workers: int = CHAT_WORKERS, max_queue: int = CHAT_QUEUE_MAX,
+                 timeout: float = CHAT_QUEUE_TIMEOUT):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="serene-llm")
+        self._slots = asyncio.Semaphore(self.workers)
+        self._in_flight = 0
+        self._avg_service = 2.0   # seconds; EWMA of generation time, seeded with a guess
+        self.rejected = {"429": 0, "503": 0}
+
+    def retry_after(self) -> int:
+        backlog = max(1, self._in_flight) / self.workers
+        return max(1, math.ceil(self._avg_service * backlog))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "avg_service_s": round(self._avg_service, 3),
+            "rejected": dict(self.rejected),
+        }
+
+    def _reject(self, status: int, detail: str):
+        self.rejected[str(status)] += 1
+        raise HTTPException(status_code=status, detail=detail,
+                            headers={"Retry-After": str(self.retry_after())})
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` on the chat executor, or raise 429/503 when overloaded."""
+        # counters are only touched on the event loop thread, so no lock needed
+        if self._in_flight >= self.workers + self.max_queue:
+            self._reject(429, "chat queue full, try again shortly")
+        self._in_flight += 1
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._in_flight -= 1
+            self._reject(503, "chat is busy, try again shortly")
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            job = self._executor.submit(fn, *args)
+        except BaseException:
+            self._job_done(None, start)
+            raise
+        # Free the slot when the worker thread is actually done, not when this
+        # coroutine is cancelled (timeout middleware, client gone, shutdown):
+        # a cancelled request can't stop a generation that is already running.
+        job.add_done_callback(lambda f: self._call_on_loop(loop, self._job_done, f, start))
+        return await asyncio.wrap_future(job)
+
+    @staticmethod
+    def _call_on_loop(loop, cb, *args):
+        try:
+            loop.call_soon_threadsafe(cb, *args)
+        except RuntimeError:
+            pass    # loop already closed (shutdown)
+
+    def _job_done(self, job, start: float):
+        if job is not None and not job.cancelled() and job.exception() is None:
+            self._avg_service = 0.8 * self._avg_service + 0.2 * (time.perf_counter() - start)
+        self._slots.release()
+        self._in_flight -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
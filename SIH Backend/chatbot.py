@@ -8,7 +8,10 @@ from sentence_transformers import SentenceTransformer, CrossEncoder
 from transformers import AutoTokenizer, AutoModelForCausalLM, AutoModelForSequenceClassification, pipeline
 
 # ================== CONFIG ==================
-CSV_PATH = r"C:\Users\HP\OneDrive\Desktop\SIH Backend\expanded_student_mental_health_chatbot.csv"
+CSV_PATH = os.getenv(
+    "CHATBOT_CSV_PATH",
+    r"C:\Users\HP\OneDrive\Desktop\SIH Backend\expanded_student_mental_health_chatbot.csv",
+)
 
 PRIMARY_LLM  = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
 FALLBACK_LLM = "Qwen/Qwen2.5-0.5B-Instruct"
@@ -250,11 +253,11 @@ def salient_phrases(text: str, max_terms: int = 2) -> list:
 
 def alive_wrap(user_text: str, model_reply: str) -> str:
     user_lower = user_text.lower()
+    feeling = infer_feeling(user_text)
     # Skip harm check if crisis (but since crises use CRISIS_MESSAGE, this is for normals)
     if any(kw in user_lower for kw in ["suicide", "hurt", "die", "kill"]):
         focus = "what you're going through"  # Safe
     else:
-        feeling = infer_feeling(user_text)
         focus_terms = salient_phrases(user_text)
         focus = ", ".join(focus_terms) if len(focus_terms) > 1 else focus_terms[0] if focus_terms else "your situation"
     
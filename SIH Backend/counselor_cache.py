@@ -0,0 +1,115 @@
+# counselor_cache.py
+# In-process cache for the counselor directory. The list changes rarely, so we
+# keep one snapshot: rows, a pre-serialized JSON body, an ETag/Last-Modified
+# pair and a specialty/language index. The DB is hit only when the snapshot is
+# invalidated or older than COUNSELOR_CACHE_TTL (picks up edits made outside
+# this process, e.g. through the sqlite CLI).
+import hashlib, json, os, threading, time
+from email.utils import formatdate, parsedate_to_datetime
+
+COUNSELOR_CACHE_TTL = float(os.getenv("COUNSELOR_CACHE_TTL", "300"))  # seconds; 0 = revalidate every call
+
+def _norm(value) -> str:
+    return str(value or "").strip().lower()
+
+def _serialize(rows) -> bytes:
+    # same bytes FastAPI's JSONResponse would produce
+    return json.dumps(rows, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+_EMPTY_BODY = _serialize([])
+_EMPTY = (_EMPTY_BODY, _etag(_EMPTY_BODY))   # shared answer for filter values we don't know
+
+class _Snapshot:
+    def __init__(self, rows, last_modified: float):
+        self.rows = rows
+        self.body = _serialize(rows)
+        self.etag = _etag(self.body)
+        self.last_modified = last_modified
+        self.last_modified_http = formatdate(last_modified, usegmt=True)
+        self.loaded_at = time.monotonic()
+        self.by_specialty, self.by_language = {}, {}
+        for i, r in enumerate(rows):
+            for spec in _norm(r.get("specialty")).split(","):
+                if spec.strip():
+                    self.by_specialty.setdefault(spec.strip(), []).append(i)
+            for lang in _norm(r.get("languages")).split(","):
+                if lang.strip():
+                    self.by_language.setdefault(lang.strip(), []).append(i)
+        self._filtered = {}   # (specialty, language) -> (body, etag); only values present in the index
+
+    def filtered(self, specialty: str, language: str):
+        """(body, etag) for the rows matching both filters; memoized per snapshot.
+
+        Unknown values get the shared empty body without touching the memo, so
+        arbitrary query strings can't grow it past specialties x languages.
+        """
+        if (specialty and specialty not in self.by_specialty) or \
+           (language and language not in self.by_language):
+            return _EMPTY
+        key = (specialty, language)
+        hit = self._filtered.get(key)
+        if hit is None:
+            idx = set(range(len(self.rows)))
+            if specialty:
+                idx &= set(self.by_specialty.get(specialty, ()))
+            if language:
+                idx &= set(self.by_language.get(language, ()))
+            body = _serialize([self.rows[i] for i in sorted(idx)])  # keep ORDER BY name
+            hit = self._filtered[key] = (body, _etag(body))
+        return hit
+
+class CounselorDirectory:
+    """Cached directory; `loader()` returns the visible counselor rows (list of dicts)."""
+    def __init__(self, loader, ttl: float = COUNSELOR_CACHE_TTL):
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snap = None
+        self.loads = 0
+
+    def invalidate(self):
+        """Call after any write to the counselors table; the next request reloads."""
+        snap = self._snap
+        if snap is not None:
+            snap.loaded_at = float("-inf")   # keep it so an unchanged reload keeps Last-Modified
+
+    def snapshot(self) -> _Snapshot:
+        snap = self._snap
+        if snap is not None and time.monotonic() - snap.loaded_at < self.ttl:
+            return snap
+        with self._lock:
+            snap = self._snap
+            if snap is not None and time.monotonic() - snap.loaded_at < self.ttl:
+                return snap     # another thread reloaded while we waited
+            rows = self.loader()
+            self.loads += 1
+            fresh = _Snapshot(rows, time.time())
+            if snap is not None and fresh.etag == snap.etag:
+                fresh = snap    # unchanged: keep Last-Modified and the filter memo
+                fresh.loaded_at = time.monotonic()
+            self._snap = fresh
+            return fresh
+
+    def lookup(self, specialty: str = None, language: str = None):
+        """Return (snapshot, body, etag) for the optional filters."""
+        snap = self.snapshot()
+        specialty, language = _norm(specialty), _norm(language)
+        if not specialty and not language:
+            return snap, snap.body, snap.etag
+        body, etag = snap.filtered(specialty, language)
+        return snap, body, etag
+
+def not_modified(if_none_match: str, if_modified_since: str, etag: str, last_modified: float) -> bool:
+    """RFC 7232 conditional GET: If-None-Match wins over If-Modified-Since."""
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}   # weak comparison
+        return "*" in tags or etag in tags
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
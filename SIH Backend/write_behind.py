@@ -0,0 +1,168 @@
+# write_behind.py
+# Optional write-behind buffer for high-volume inserts (mood check-ins, journal
+# autosaves). Rows from many requests are grouped into one executemany
+# transaction, so a burst costs one commit/fsync instead of one per row.
+#
+# Durability modes (WRITE_BEHIND):
+#   off    – no buffer; each request commits its own row (default)
+#   group  – request waits until its batch is committed ("group commit"):
+#            same durability as "off", fewer fsyncs
+#   async  – request returns as soon as the row is queued. A clean shutdown
+#            (close()) drains the buffer; a crash or kill loses every row still
+#            queued – up to WRITE_BEHIND_MAX_PENDING rows under a backlog
+import os, sys, queue, sqlite3, threading, time
+from concurrent.futures import Future
+
+WRITE_BEHIND             = os.getenv("WRITE_BEHIND", "off").lower()
+WRITE_BEHIND_INTERVAL_MS = float(os.getenv("WRITE_BEHIND_INTERVAL_MS", "25"))
+WRITE_BEHIND_MAX_BATCH   = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "256"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000"))  # queued rows before callers are turned away
+WRITE_BEHIND_ENQUEUE_TIMEOUT = float(os.getenv("WRITE_BEHIND_ENQUEUE_TIMEOUT", "0.5"))  # max wait for queue space
+WRITE_BEHIND_RETRIES     = int(os.getenv("WRITE_BEHIND_RETRIES", "2"))  # whole-batch retries on lock/IO errors
+MODES = {"off", "group", "async"}
+
+def insert_batch(conn, insert_sql: str, select_sql: str, rows: list) -> list:
+    """executemany `rows` in one transaction and return the inserted rows as dicts.
+
+    `select_sql` must take (first_id, last_id). Ids are contiguous because SQLite
+    holds the write lock for the whole transaction. The read-back runs before the
+    commit, so if this raises, nothing was written.
+    """
+    if not rows:
+        return []
+    try:
+        conn.executemany(insert_sql, rows)
+        last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        first = last - len(rows) + 1
+        out = [dict(r) for r in conn.execute(select_sql, (first, last)).fetchall()]
+        if len(out) != len(rows):
+            raise RuntimeError(f"read back {len(out)} of {len(rows)} inserted rows")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return out
+
+class WriteBehind:
+    """Background thread that drains a queue of (statement key, params) into batches.
+
+    `statements` maps a key to (insert_sql, select_sql) as used by insert_batch().
+    submit() returns a Future resolved with the inserted row once it is committed.
+    Cancelling the future before its batch starts keeps the row from being written.
+    """
+    def __init__(self, db_path: str, statements: dict, interval_ms: float = WRITE_BEHIND_INTERVAL_MS,
+                 max_batch: int = WRITE_BEHIND_MAX_BATCH, max_pending: int = WRITE_BEHIND_MAX_PENDING,
+                 retries: int = WRITE_BEHIND_RETRIES):
+        self.db_path = db_path
+        self.statements = statements
+        self.interval = interval_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.retries = max(0, retries)
+        self._q = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self.stats = {"rows": 0, "batches": 0, "failed": 0}
+        self._thread.start()
+
+    def submit(self, key: str, params: tuple, timeout: float = WRITE_BEHIND_ENQUEUE_TIMEOUT) -> Future:
+        """Queue one row; raises queue.Full if there is no room within `timeout` seconds."""
+        if key not in self.statements:
+            raise KeyError(key)
+        if self._stop.is_set():
+            raise RuntimeError("write-behind buffer is closed")
+        fut = Future()
+        self._q.put((key, params, fut), timeout=timeout)
+        return fut
+
+    def pending(self) -> int:
+        return self._q.qsize()
+
+    def close(self, timeout: float = None):
+        """Flush everything still queued, then stop the thread.
+
+        Waits until the queue is drained by default; each batch is bounded by
+        (retries + 1) busy timeouts, so this terminates even on a locked DB.
+        """
+        self._stop.set()
+        self._thread.join(timeout)
+
+    # ---------- worker ----------
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        try:
+            while not (self._stop.is_set() and self._q.empty()):
+                batch = self._collect()
+                if batch:
+                    self._flush(conn, batch)
+        finally:
+            conn.close()
+
+    def _collect(self) -> list:
+        """Wait for one item, then keep taking until max_batch or the interval elapses."""
+        try:
+            batch = [self._q.get(timeout=self.interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._q.get(timeout=remaining) if remaining > 0 else self._q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, conn, batch: list):
+        groups = {}
+        for key, params, fut in batch:
+            # callers that gave up (group-mode timeout) cancelled their future;
+            # skip those rows so a 503 really means "not written"
+            if fut.set_running_or_notify_cancel():
+                groups.setdefault(key, []).append((params, fut))
+        for key, items in groups.items():
+            insert_sql, select_sql = self.statements[key]
+            self._write_group(conn, insert_sql, select_sql, items)
+
+    def _write_group(self, conn, insert_sql, select_sql, items):
+        params = [p for p, _ in items]
+        for _ in range(self.retries + 1):
+            try:
+                rows = insert_batch(conn, insert_sql, select_sql, params)
+            except sqlite3.IntegrityError:
+                # a bad row: the batch was rolled back, isolate it so the others still land
+                self._write_rows(conn, insert_sql, select_sql, items)
+                return
+            except sqlite3.OperationalError as e:
+                err = e     # locked / busy / disk: not the rows' fault, retry the whole batch
+                continue
+            except Exception as e:
+                err = e
+                break
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(items)
+            for (_, fut), row in zip(items, rows):
+                fut.set_result(row)
+            return
+        self._fail(items, err)
+
+    def _write_rows(self, conn, insert_sql, select_sql, items):
+        """Row-by-row fallback after an IntegrityError; a DB-level error fails the rest at once."""
+        for n, (params, fut) in enumerate(items):
+            try:
+                row = insert_batch(conn, insert_sql, select_sql, [params])[0]
+            except sqlite3.IntegrityError as e:
+                self._fail([(params, fut)], e)
+                continue
+            except Exception as e:
+                self._fail(items[n:], e)
+                return
+            self.stats["batches"] += 1
+            self.stats["rows"] += 1
+            fut.set_result(row)
+
+    def _fail(self, items, err):
+        self.stats["failed"] += len(items)
+        print(f"[write-behind] {len(items)} row(s) failed: {err}", file=sys.stderr)
+        for _, fut in items:
+            fut.set_exception(err)